@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Analysis Result Cache
+Persistent content-addressed store for analyzer results. Entries are keyed
+by a digest covering the source bytes and the active rule set, so edited
+files and edited guidelines both miss naturally, and stored as plain JSON
+so any analyzer version can read them back.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, List, Optional
+
+# Keys are sharded by their first two hex digits so no single directory
+# grows unboundedly on large repositories.
+CACHE_ROOT = Path.home() / '.cache' / 'cpp_guidelines'
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_ROOT / key[:2] / f"{key}.json"
+
+
+def get(key: str) -> Optional[List[Any]]:
+    """Return the stored entries for key, or None on a miss.
+
+    A corrupt or unreadable entry degrades to a miss.
+    """
+    try:
+        with open(_entry_path(key), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def put(key: str, entries: List[Any]) -> None:
+    """Store JSON-serializable entries under key, best effort."""
+    try:
+        path = _entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(entries, f)
+    except OSError:
+        pass
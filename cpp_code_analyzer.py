@@ -7,31 +7,402 @@ Analyzes C++ files for coding guideline violations based on comprehensive C++ gu
 import os
 import re
 import json
-from typing import List, Dict, Any, Tuple, Optional
-from dataclasses import dataclass
+import mmap
+import hashlib
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 import argparse
 
+import analysis_cache
 
-@dataclass
+try:
+    import ahocorasick
+    # The automaton must accept bytes keys (pyahocorasick built in bytes
+    # mode); unicode-mode builds would force a per-line decode, so treat
+    # them the same as the module being absent.
+    _probe = ahocorasick.Automaton()
+    try:
+        _probe.add_word(b'x', 0)
+    except TypeError:
+        ahocorasick = None
+    del _probe
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+def _compile(pattern: bytes):
+    """Compile a pattern through RE2 when available, else stdlib re.
+
+    RE2 runs every pattern in linear time with no backtracking, which pays
+    off on the alternation-heavy structural patterns. It rejects constructs
+    it cannot guarantee linear (e.g. backreferences); those patterns simply
+    stay on the stdlib engine. Flags are not accepted: google-re2's second
+    argument is an Options object, not the stdlib flag ints, so callers
+    express modes inline (e.g. ``(?s)``), which both engines understand.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            # re2.error for unsupported constructs; anything else from the
+            # binding also degrades to the stdlib engine rather than failing.
+            pass
+    return re.compile(pattern)
+
+# Bump whenever a check's behavior changes. The persistent result cache and
+# the mtime index both key on this, so an upgraded analyzer never serves
+# entries written by an older one for identical content and guidelines.
+_ANALYZER_VERSION = 1
+
+# Trigger literals implied by the default guideline patterns: every match of
+# the pattern on the left must contain one of the literals on the right. A
+# customized pattern has no entry here, and the line-scanner prefilter stands
+# down for that rule set rather than guess (a wrong literal would silently
+# drop violations).
+_PATTERN_TRIGGERS = {
+    r'\b(if|for|while|switch|catch)\(': (b'(',),
+    r'\b(NULL|0)\b(?=\s*[;,)])': (b'NULL', b'0'),
+    r'\[=\]|\[\&\]': (b'[',),
+    r'using\s+namespace\s+std\s*;': (b'using',),
+}
+
+# Files at or above this size are memory-mapped instead of read into a
+# bytes object; the byte patterns and line slicing scan the map directly.
+_MMAP_THRESHOLD = 1 << 20
+
+# Byte classes for the hand-rolled function-signature scanner.
+_WS = frozenset(b' \t\n\r\f\v')
+_IDENT_START = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+_IDENT_BODY = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+_TYPE_BODY = _IDENT_BODY | frozenset(b'<>:')
+_QUALIFIERS = (b'virtual', b'static', b'inline')
+
+
+def _match_function_signature(line: bytes) -> int:
+    """Return the terminating byte (ord ';' or ord '{') if the line looks like
+    a function declaration or definition, else 0.
+
+    Hand-rolled equivalent of the old
+    ``^\\s*(?:virtual\\s+|static\\s+|inline\\s+)*(?:const\\s+)?type\\s+name\\s*\\([^)]*\\)\\s*(?:const\\s*)?[;{]``
+    regexes: one left-to-right scan with no backtracking, so the common
+    non-matching line is rejected in O(len) instead of exercising the
+    regex engine's optional-group machinery.
+    """
+    n = len(line)
+
+    def skip_ws(j: int) -> int:
+        while j < n and line[j] in _WS:
+            j += 1
+        return j
+
+    def word_end(j: int, body: frozenset) -> int:
+        if j < n and line[j] in _IDENT_START:
+            j += 1
+            while j < n and line[j] in body:
+                j += 1
+        return j
+
+    def tail(j: int) -> int:
+        # return type, whitespace, function name
+        end = word_end(j, _TYPE_BODY)
+        if end == j or end >= n or line[end] not in _WS:
+            return 0
+        j = skip_ws(end)
+        end = word_end(j, _IDENT_BODY)
+        if end == j:
+            return 0
+        j = skip_ws(end)
+        if j >= n or line[j] != 0x28:  # '('
+            return 0
+        close = line.find(b')', j + 1)
+        if close == -1:
+            return 0
+        j = skip_ws(close + 1)
+        end = word_end(j, _IDENT_BODY)
+        if line[j:end] == b'const':
+            j = skip_ws(end)
+        if j < n and line[j] in b';{':
+            return line[j]
+        return 0
+
+    def const_tail(j: int) -> int:
+        # optional 'const' qualifier; like the regex, 'const' may instead
+        # serve as the return type itself (e.g. 'const Foo();')
+        end = word_end(j, _IDENT_BODY)
+        if line[j:end] == b'const' and end < n and line[end] in _WS:
+            terminator = tail(skip_ws(end))
+            if terminator:
+                return terminator
+        return tail(j)
+
+    # any number of virtual/static/inline qualifiers, each followed by space.
+    # A qualifier word may also act as the return type ('static Foo();'), so
+    # mirror the regex's backtracking by retrying from each qualifier start.
+    i = skip_ws(0)
+    positions = [i]
+    while True:
+        end = word_end(i, _IDENT_BODY)
+        if line[i:end] in _QUALIFIERS and end < n and line[end] in _WS:
+            i = skip_ws(end)
+            positions.append(i)
+            continue
+        break
+
+    for start in reversed(positions):
+        terminator = const_tail(start)
+        if terminator:
+            return terminator
+    return 0
+
+
+def _text(raw: bytes) -> str:
+    """Decode a byte slice for display in a violation report."""
+    return raw.decode('utf-8', errors='replace')
+
+
+# Templates for suggestions that embed match context. The checks store a
+# ("key", args) pack on the violation instead of a pre-built f-string, and
+# the text is only formatted when a report actually reads it — on a run
+# that produces thousands of violations but is consumed as counts, none of
+# these strings are ever materialized.
+_SUGGESTION_TEMPLATES: Dict[str, str] = {
+    "line_length": "Consider breaking this line into multiple lines (current: %d chars)",
+    "class_naming": "Class name '%s' should use PascalCase",
+    "constant_naming": "Constant '%s' should use 'k' prefix followed by PascalCase",
+    "function_naming": "Function name '%s' should use PascalCase",
+    "member_naming": "Member variable '%s' should be prefixed with 'm_'",
+    "function_length": "Function is %d lines long, consider breaking it down",
+}
+
+
+@dataclass(slots=True, frozen=True)
 class Violation:
-    """Represents a coding guideline violation."""
+    """Represents a coding guideline violation.
+
+    Slotted and frozen: large PRs can produce tens of thousands of these,
+    so dropping the per-instance __dict__ roughly thirds the memory cost,
+    and nothing mutates a violation after construction.
+    """
     rule_name: str
     description: str
     file_path: str
     line_number: int
     line_content: str
     severity: str  # 'error', 'warning', 'info'
-    suggestion: str = ""
+    suggestion: Any = ""  # str, or a deferred (template_key, args) pack
+
+    def suggestion_text(self) -> str:
+        """Format the suggestion, resolving a deferred (template_key, args) pack."""
+        suggestion = self.suggestion
+        if isinstance(suggestion, str):
+            return suggestion
+        key, args = suggestion
+        return _SUGGESTION_TEMPLATES[key] % tuple(args)
+
+
+def summarize(violations: List[Violation]) -> Dict[str, int]:
+    """Count violations by severity in a single pass."""
+    counts = Counter(v.severity for v in violations)
+    return {
+        "errors": counts["error"],
+        "warnings": counts["warning"],
+        "info": counts["info"],
+    }
+
+
+def dumps_json(payload: Dict[str, Any]) -> str:
+    """Serialize a report payload as indented JSON.
+
+    orjson, when installed, serializes at C speed and with far fewer
+    intermediate allocations than the stdlib on reports carrying thousands
+    of violations; the stdlib is the drop-in fallback.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(payload, indent=2)
+
+
+def violations_to_dicts(violations: List[Violation]) -> List[Dict[str, Any]]:
+    """Serialize violations for JSON output, resolving deferred suggestions."""
+    dicts = []
+    for violation in violations:
+        entry = asdict(violation)
+        entry["suggestion"] = violation.suggestion_text()
+        dicts.append(entry)
+    return dicts
 
 
 class CppGuidelinesAnalyzer:
     """Analyzes C++ code against comprehensive C++ guidelines."""
     
-    def __init__(self, guidelines_file: Optional[str] = None):
-        self.guidelines = self.load_guidelines(guidelines_file)
+    def __init__(self, guidelines_file: Optional[str] = None,
+                 guidelines: Optional[Dict[str, Any]] = None):
+        self.guidelines = guidelines if guidelines is not None else self.load_guidelines(guidelines_file)
         self.violations: List[Violation] = []
-    
+        self._rule_info = self._flatten_rule_info()
+        self._compile_patterns()
+        # Results are memoized by (content hash, guidelines hash): CI tends to
+        # re-scan the same unchanged files across jobs and re-runs, so hits
+        # skip the analysis passes entirely.
+        self._guidelines_hash = hashlib.blake2b(
+            json.dumps(self.guidelines, sort_keys=True).encode('utf-8'),
+            digest_size=16).hexdigest()
+        self._result_cache: Dict[str, List[Violation]] = {}
+
+    def _flatten_rule_info(self) -> Dict[str, tuple]:
+        """Flatten the nested guidelines into rule_name -> (description, severity, suggestion).
+
+        The checks unpack these tuples once per file instead of walking three
+        levels of dicts for every violation they emit. Suggestions that embed
+        match context stay as f-strings at the emission site.
+        """
+        guidelines = self.guidelines
+        fmt = guidelines["formatting"]
+        naming = guidelines["naming_conventions"]
+        best = guidelines["best_practices"]
+        structure = guidelines["code_structure"]
+        return {
+            "line_length": (fmt["line_length"]["rule"], fmt["line_length"]["severity"], ""),
+            "trailing_whitespace": (fmt["trailing_whitespace"]["rule"], fmt["trailing_whitespace"]["severity"], ""),
+            "indentation_tabs": ("Use spaces instead of tabs for indentation", "warning", "Replace tabs with 2 spaces"),
+            "space_after_keywords": (fmt["space_after_keywords"]["rule"], fmt["space_after_keywords"]["severity"],
+                                     "Add space between keyword and parenthesis: 'if (condition)'"),
+            "smart_pointers": (best["smart_pointers"]["rule"], best["smart_pointers"]["severity"],
+                               best["smart_pointers"]["suggestion"]),
+            "nullptr_usage": (best["nullptr_usage"]["rule"], best["nullptr_usage"]["severity"],
+                              best["nullptr_usage"]["suggestion"]),
+            "namespace_usage": (best["namespace_std_in_headers"]["rule"], best["namespace_std_in_headers"]["severity"],
+                                "Use specific std:: prefixes instead"),
+            "lambda_captures": (guidelines["modern_cpp"]["lambda_captures"]["rule"],
+                                guidelines["modern_cpp"]["lambda_captures"]["severity"],
+                                guidelines["modern_cpp"]["lambda_captures"]["suggestion"]),
+            "class_naming": (naming["class_names"]["rule"], naming["class_names"]["severity"], ""),
+            "function_naming": (naming["function_names"]["rule"], naming["function_names"]["severity"], ""),
+            "member_variable_naming": (naming["member_variables"]["rule"], naming["member_variables"]["severity"], ""),
+            "constant_naming": (naming["constant_names"]["rule"], naming["constant_names"]["severity"], ""),
+            "include_guards": (structure["include_guards"]["rule"], structure["include_guards"]["severity"],
+                               "Add #pragma once at the top or use #ifndef guards"),
+            "function_length": (structure["function_length"]["rule"], structure["function_length"]["severity"], ""),
+            "function_comments": (guidelines["comments"]["function_comments"]["rule"],
+                                  guidelines["comments"]["function_comments"]["severity"],
+                                  "Add Doxygen-style comment above function declaration"),
+        }
+
+    def _compile_patterns(self) -> None:
+        """Compile every guideline regex once so the per-line checks reuse re.Pattern objects.
+
+        Patterns are compiled against bytes: every guideline regex is pure
+        ASCII, so matching the raw file bytes is equivalent to matching the
+        decoded text (UTF-8 continuation bytes can never match an ASCII
+        character class), and it skips the per-file UTF-8 decode entirely.
+        Byte slices are only decoded on the cold path when a violation is
+        actually reported.
+        """
+        guidelines = self.guidelines
+
+        # All regex-driven per-line rules fused into one alternation so each
+        # line enters the regex engine once; handlers dispatch on lastgroup.
+        memory_keywords = guidelines["best_practices"]["smart_pointers"]["keywords"]
+        rule_patterns = (
+            guidelines["formatting"]["space_after_keywords"]["pattern"],
+            guidelines["best_practices"]["nullptr_usage"]["pattern"],
+            guidelines["modern_cpp"]["lambda_captures"]["pattern"],
+            guidelines["best_practices"]["namespace_std_in_headers"]["pattern"],
+        )
+        self._line_scanner = _compile('|'.join((
+            '(?P<kw_paren>' + rule_patterns[0] + ')',
+            r'(?P<new_delete>\b(?:' + '|'.join(map(re.escape, memory_keywords)) + r')\b)',
+            '(?P<null>' + rule_patterns[1] + ')',
+            '(?P<lambda>' + rule_patterns[2] + ')',
+            '(?P<ns_std>' + rule_patterns[3] + ')',
+        )).encode('ascii'))
+
+        # Trigger literals for the cheap line gate, derived from the loaded
+        # guidelines: the smart-pointer keywords are their own literals, and
+        # the pattern-driven groups look up the literals their (default)
+        # pattern implies. A pattern with no known literals disables the
+        # gate entirely — every line then reaches the scanner — so custom
+        # rule sets stay correct at the cost of the prefilter.
+        tokens = [kw.encode('ascii') for kw in memory_keywords]
+        self._trigger_tokens: Optional[tuple] = None
+        for pattern in rule_patterns:
+            literals = _PATTERN_TRIGGERS.get(pattern)
+            if literals is None:
+                break
+            tokens.extend(literals)
+        else:
+            self._trigger_tokens = tuple(dict.fromkeys(tokens))
+
+        # Naming-convention patterns (matched against extracted identifiers)
+        naming = guidelines["naming_conventions"]
+        self._pat_class_name = _compile(naming["class_names"]["pattern"].encode('ascii'))
+        self._pat_function_name = _compile(naming["function_names"]["pattern"].encode('ascii'))
+        self._pat_member_name = _compile(naming["member_variables"]["pattern"].encode('ascii'))
+        self._pat_constant_name = _compile(naming["constant_names"]["pattern"].encode('ascii'))
+
+        # Structural patterns used to find declarations in the source
+        self._pat_class = _compile(rb'class\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+        self._pat_function = _compile(
+            rb'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:const\s*)?(?:{|;)')
+        self._pat_member_var = _compile(
+            rb'^\s*(?:static\s+|const\s+|mutable\s+)*[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[;=]')
+        self._pat_const = _compile(rb'const\s+[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+        self._pat_class_kw = _compile(rb'\b(?:class|struct)\s')
+        self._pat_brace = _compile(rb'[{}]')
+        self._pat_include_guard = _compile(rb'(?s)#ifndef\s+[A-Z_]+\s*\n.*#define\s+[A-Z_]+')
+
+        # Optional Hyperscan database for the whole-file naming scans: one
+        # vectorized multi-pattern pass reports candidate offsets, and Python
+        # re only runs at those offsets to extract the identifier. Hyperscan
+        # has no capture groups, so the expressions are the capture-free twins
+        # of _pat_class/_pat_const.
+        self._hs_db = None
+        if hyperscan is not None:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[
+                    rb'class\s+[a-zA-Z_][a-zA-Z0-9_]*',
+                    rb'const\s+[a-zA-Z_][a-zA-Z0-9_<>:]*\s+[a-zA-Z_][a-zA-Z0-9_]*',
+                ],
+                ids=[0, 1],
+                flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * 2,
+            )
+            self._hs_db = db
+
+        # Optional Aho-Corasick prefilter: finds any trigger literal in one
+        # C-level pass over the line instead of one membership scan per token.
+        self._trigger_automaton = None
+        if ahocorasick is not None and self._trigger_tokens is not None:
+            automaton = ahocorasick.Automaton()
+            for token in self._trigger_tokens:
+                automaton.add_word(token, token)
+            automaton.make_automaton()
+            self._trigger_automaton = automaton
+
     def load_guidelines(self, guidelines_file: Optional[str] = None) -> Dict[str, Any]:
         """Load guidelines from file or use default guidelines."""
         if guidelines_file and os.path.exists(guidelines_file):
@@ -202,358 +573,680 @@ class CppGuidelinesAnalyzer:
             }
         }
     
-    def analyze_file(self, file_path: str) -> List[Violation]:
-        """Analyze a single C++ file for guideline violations."""
+    def analyze_file(self, file_path: str, data: Optional[bytes] = None) -> List[Violation]:
+        """Analyze a single C++ file for guideline violations.
+
+        data, when given, is the file's content already read by the caller
+        (e.g. the prefetch threads in analyze_pr_files), skipping the open
+        and read here.
+        """
         if not file_path.endswith(('.cpp', '.cc', '.cxx', '.c', '.hpp', '.h', '.hxx')):
             return []
-        
+
         violations = []
-        
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            is_header = file_path.endswith(('.h', '.hpp', '.hxx'))
-            
-            violations.extend(self._check_line_length(file_path, lines))
-            violations.extend(self._check_formatting(file_path, lines))
-            violations.extend(self._check_naming_conventions(file_path, lines))
-            violations.extend(self._check_best_practices(file_path, lines, is_header))
-            violations.extend(self._check_code_structure(file_path, lines, is_header))
-            violations.extend(self._check_modern_cpp(file_path, lines))
-            violations.extend(self._check_comments(file_path, lines, is_header))
-            
+            if data is None:
+                with open(file_path, 'rb') as f:
+                    # Large (typically generated) files get a zero-copy
+                    # read-only map instead of a whole-file read; everything
+                    # downstream operates on the buffer the same way it
+                    # would on bytes.
+                    if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+                        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        if hasattr(data, 'madvise'):
+                            # Every pass over the map is front-to-back, so
+                            # let the kernel read ahead aggressively.
+                            data.madvise(mmap.MADV_SEQUENTIAL)
+                    else:
+                        data = f.read()
+
+            try:
+                is_header = file_path.endswith(('.h', '.hpp', '.hxx'))
+
+                # The header-only rules make results depend on the extension
+                # class as well as the bytes, so it is part of the key:
+                # identical content as .h and .cpp must not share an entry.
+                cache_key = (f"{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+                             f"-v{_ANALYZER_VERSION}-{self._guidelines_hash}"
+                             f"-{'h' if is_header else 's'}")
+                cached = self._cache_lookup(cache_key)
+                if cached is not None:
+                    # The hit may come from identical content under another
+                    # path; rebind the violations to the path being analyzed.
+                    return [replace(v, file_path=file_path) for v in cached]
+
+                starts = self._line_offsets(data)
+
+                violations.extend(self._check_all_line_level(
+                    file_path, self._iter_lines(data, starts), is_header,
+                    check_line_length=np is None))
+                if np is not None:
+                    violations.extend(self._check_line_length_np(file_path, data, starts))
+                violations.extend(self._check_naming_conventions(file_path, data, starts))
+                violations.extend(self._check_code_structure(file_path, data, starts, is_header))
+                violations.extend(self._check_comments(file_path, self._iter_lines(data, starts), is_header))
+
+                self._cache_store(cache_key, violations)
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
         except Exception as e:
             print(f"Error analyzing file {file_path}: {e}")
         
         return violations
-    
-    def _check_line_length(self, file_path: str, lines: List[str]) -> List[Violation]:
-        """Check for lines exceeding maximum length."""
-        violations = []
+
+    def _cache_lookup(self, cache_key: str) -> Optional[List[Violation]]:
+        """Return the memoized violations for a cache key, or None on a miss."""
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        entries = analysis_cache.get(cache_key)
+        if entries is None:
+            return None
+        cached = [Violation(**entry) for entry in entries]
+        self._result_cache[cache_key] = cached
+        return cached
+
+    def _cache_store(self, cache_key: str, violations: List[Violation]) -> None:
+        """Memoize a file's violations in memory and, best effort, on disk."""
+        self._result_cache[cache_key] = violations
+        analysis_cache.put(cache_key, [asdict(v) for v in violations])
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the per-path (mtime_ns, size, violations) index for this run.
+
+        A guidelines change or an analyzer upgrade invalidates every entry
+        at once via the stored hash and version; a missing or corrupt index
+        degrades to an empty one.
+        """
+        try:
+            with open(analysis_cache.CACHE_ROOT / 'index.json', 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (index.get('guidelines_hash') != self._guidelines_hash
+                or index.get('analyzer_version') != _ANALYZER_VERSION):
+            return {}
+        return index.get('files', {})
+
+    def _save_index(self, files: Dict[str, Any]) -> None:
+        """Persist the per-path index, best effort."""
+        try:
+            analysis_cache.CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+            with open(analysis_cache.CACHE_ROOT / 'index.json', 'w') as f:
+                json.dump({'guidelines_hash': self._guidelines_hash,
+                           'analyzer_version': _ANALYZER_VERSION,
+                           'files': files}, f)
+        except OSError:
+            pass
+
+    def _check_all_line_level(self, file_path: str, lines: Iterable[bytes], is_header: bool,
+                              check_line_length: bool = True) -> List[Violation]:
+        """Run every line-local check in a single pass over the file.
+
+        Fuses the line-length, formatting, best-practice and modern-C++ checks
+        so each line is visited (and stays cache-hot) exactly once instead of
+        being re-iterated by several independent loops.
+        """
+        violations: List[Violation] = []
+        append = violations.append
+        rule_info = self._rule_info
+
         max_length = self.guidelines["formatting"]["line_length"]["max_length"]
-        
-        for i, line in enumerate(lines, 1):
-            line_content = line.rstrip()
-            if len(line_content) > max_length:
-                # Allow exceptions for certain cases
-                if (line.strip().startswith('//') or  # Long comments
-                    line.strip().startswith('#include') or  # Include statements  
-                    line.strip().startswith('#ifndef') or  # Header guards
-                    'http' in line.lower()):  # URLs
-                    continue
-                    
-                violations.append(Violation(
-                    rule_name="line_length",
-                    description=self.guidelines["formatting"]["line_length"]["rule"],
+        scan = self._line_scanner.finditer
+        trigger_automaton = self._trigger_automaton
+        trigger_tokens = self._trigger_tokens
+
+        desc_length, sev_length, _ = rule_info["line_length"]
+        desc_trailing, sev_trailing, _ = rule_info["trailing_whitespace"]
+        desc_tabs, sev_tabs, sugg_tabs = rule_info["indentation_tabs"]
+        desc_kw, sev_kw, sugg_kw = rule_info["space_after_keywords"]
+        desc_smart, sev_smart, sugg_smart = rule_info["smart_pointers"]
+        desc_null, sev_null, sugg_null = rule_info["nullptr_usage"]
+        desc_ns, sev_ns, sugg_ns = rule_info["namespace_usage"]
+        desc_lambda, sev_lambda, sugg_lambda = rule_info["lambda_captures"]
+
+        def _on_kw_paren(i: int, stripped: bytes, rstripped: bytes, is_comment_line: bool) -> None:
+            append(Violation(
+                rule_name="space_after_keywords",
+                description=desc_kw,
+                file_path=file_path,
+                line_number=i,
+                line_content=_text(rstripped),
+                severity=sev_kw,
+                suggestion=sugg_kw
+            ))
+
+        def _on_new_delete(i: int, stripped: bytes, rstripped: bytes, is_comment_line: bool) -> None:
+            if not is_comment_line:
+                append(Violation(
+                    rule_name="smart_pointers",
+                    description=desc_smart,
                     file_path=file_path,
                     line_number=i,
-                    line_content=line_content,
-                    severity=self.guidelines["formatting"]["line_length"]["severity"],
-                    suggestion=f"Consider breaking this line into multiple lines (current: {len(line_content)} chars)"
+                    line_content=_text(stripped),
+                    severity=sev_smart,
+                    suggestion=sugg_smart
                 ))
-        
-        return violations
-    
-    def _check_formatting(self, file_path: str, lines: List[str]) -> List[Violation]:
-        """Check formatting issues."""
-        violations = []
-        
+
+        def _on_null(i: int, stripped: bytes, rstripped: bytes, is_comment_line: bool) -> None:
+            if not is_comment_line:
+                append(Violation(
+                    rule_name="nullptr_usage",
+                    description=desc_null,
+                    file_path=file_path,
+                    line_number=i,
+                    line_content=_text(stripped),
+                    severity=sev_null,
+                    suggestion=sugg_null
+                ))
+
+        def _on_lambda(i: int, stripped: bytes, rstripped: bytes, is_comment_line: bool) -> None:
+            append(Violation(
+                rule_name="lambda_captures",
+                description=desc_lambda,
+                file_path=file_path,
+                line_number=i,
+                line_content=_text(stripped),
+                severity=sev_lambda,
+                suggestion=sugg_lambda
+            ))
+
+        def _on_ns_std(i: int, stripped: bytes, rstripped: bytes, is_comment_line: bool) -> None:
+            if is_header:
+                append(Violation(
+                    rule_name="namespace_usage",
+                    description=desc_ns,
+                    file_path=file_path,
+                    line_number=i,
+                    line_content=_text(stripped),
+                    severity=sev_ns,
+                    suggestion=sugg_ns
+                ))
+
+        handlers = {
+            "kw_paren": _on_kw_paren,
+            "new_delete": _on_new_delete,
+            "null": _on_null,
+            "lambda": _on_lambda,
+            "ns_std": _on_ns_std,
+        }
+
         for i, line in enumerate(lines, 1):
-            # Check trailing whitespace (but not empty lines)
-            # Remove newline first, then check for trailing spaces/tabs
-            line_without_newline = line.rstrip('\n\r')
-            if line_without_newline.strip() and line_without_newline != line_without_newline.rstrip():
-                violations.append(Violation(
-                    rule_name="trailing_whitespace",
-                    description=self.guidelines["formatting"]["trailing_whitespace"]["rule"],
+            stripped = line.strip()
+            rstripped = line.rstrip()
+            is_comment_line = stripped.startswith(b'//')
+
+            # Line length (with exceptions for comments, includes, guards,
+            # URLs); skipped when the vectorized pre-pass handles it.
+            if check_line_length and len(rstripped) > max_length and not (
+                    is_comment_line or
+                    stripped.startswith(b'#include') or
+                    stripped.startswith(b'#ifndef') or
+                    b'http' in line.lower()):
+                append(Violation(
+                    rule_name="line_length",
+                    description=desc_length,
                     file_path=file_path,
                     line_number=i,
-                    line_content=line_without_newline.rstrip(),
-                    severity=self.guidelines["formatting"]["trailing_whitespace"]["severity"]
+                    line_content=_text(rstripped),
+                    severity=sev_length,
+                    suggestion=("line_length", (len(rstripped),))
                 ))
-            
-            # Check for tabs instead of spaces
-            if '\t' in line:
-                violations.append(Violation(
-                    rule_name="indentation_tabs",
-                    description="Use spaces instead of tabs for indentation",
+
+            # Trailing whitespace (but not empty lines)
+            line_without_newline = line.rstrip(b'\n\r')
+            if stripped and line_without_newline != rstripped:
+                append(Violation(
+                    rule_name="trailing_whitespace",
+                    description=desc_trailing,
                     file_path=file_path,
                     line_number=i,
-                    line_content=line.rstrip(),
-                    severity="warning",
-                    suggestion="Replace tabs with 2 spaces"
+                    line_content=_text(rstripped),
+                    severity=sev_trailing
                 ))
-            
-            # Check space after keywords
-            if re.search(self.guidelines["formatting"]["space_after_keywords"]["pattern"], line):
-                violations.append(Violation(
-                    rule_name="space_after_keywords",
-                    description=self.guidelines["formatting"]["space_after_keywords"]["rule"],
+
+            # Tabs instead of spaces
+            if b'\t' in line:
+                append(Violation(
+                    rule_name="indentation_tabs",
+                    description=desc_tabs,
                     file_path=file_path,
                     line_number=i,
-                    line_content=line.rstrip(),
-                    severity=self.guidelines["formatting"]["space_after_keywords"]["severity"],
-                    suggestion="Add space between keyword and parenthesis: 'if (condition)'"
+                    line_content=_text(rstripped),
+                    severity=sev_tabs,
+                    suggestion=sugg_tabs
                 ))
-        
+
+            # Cheap literal gate: none of the scanner's rules can fire unless
+            # one of the trigger tokens is present. With pyahocorasick the
+            # line is scanned once for all tokens; otherwise fall back to one
+            # memchr-speed membership test per token. Most lines fail every
+            # test and never enter the regex engine. trigger_tokens is None
+            # when the loaded guidelines carry patterns we have no literals
+            # for, and every line goes to the scanner.
+            if trigger_automaton is not None:
+                if next(trigger_automaton.iter(line), None) is None:
+                    continue
+            elif trigger_tokens is not None and not any(
+                    token in line for token in trigger_tokens):
+                continue
+
+            # Regex-driven rules: one pass of the combined scanner, dispatch on
+            # the named group that fired. Each rule still reports at most once
+            # per line per matched token, as the individual searches did.
+            seen = set()
+            for m in scan(line):
+                group = m.lastgroup
+                key = m.group() if group == "new_delete" else group
+                if key in seen:
+                    continue
+                seen.add(key)
+                handlers[group](i, stripped, rstripped, is_comment_line)
+
         return violations
-    
-    def _check_naming_conventions(self, file_path: str, lines: List[str]) -> List[Violation]:
+
+    def _check_line_length_np(self, file_path: str, data: bytes, starts: List[int]) -> List[Violation]:
+        """Vectorized replacement for the in-loop line-length check.
+
+        One np.diff over the offset table yields every raw line length in C,
+        so only the (typically tiny) candidate set of over-long lines is
+        sliced out of the buffer and run through the exception filters.
+        """
+        violations: List[Violation] = []
+        max_length = self.guidelines["formatting"]["line_length"]["max_length"]
+        desc_length, sev_length, _ = self._rule_info["line_length"]
+
+        offsets = np.fromiter(starts, dtype=np.int64, count=len(starts))
+        raw_lens = np.diff(offsets, append=len(data))
+        for idx in np.flatnonzero(raw_lens > max_length).tolist():
+            line = self._line_at(data, starts, idx + 1)
+            rstripped = line.rstrip()
+            if len(rstripped) <= max_length:
+                continue
+            stripped = line.strip()
+            if (stripped.startswith(b'//') or
+                    stripped.startswith(b'#include') or
+                    stripped.startswith(b'#ifndef') or
+                    b'http' in line.lower()):
+                continue
+            violations.append(Violation(
+                rule_name="line_length",
+                description=desc_length,
+                file_path=file_path,
+                line_number=idx + 1,
+                line_content=_text(rstripped),
+                severity=sev_length,
+                suggestion=("line_length", (len(rstripped),))
+            ))
+        return violations
+
+    @staticmethod
+    def _line_offsets(data: bytes) -> List[int]:
+        """Record the start offset of every line in the buffer.
+
+        The offsets let whole-file regex matches be mapped back to a line
+        number with bisect_right in O(log N), individual lines be sliced out
+        on demand, and the per-line checks stream over the buffer without
+        ever materializing a list of line objects.
+        """
+        starts = [0]
+        append = starts.append
+        find = data.find
+        pos = find(b'\n')
+        while pos != -1:
+            append(pos + 1)
+            pos = find(b'\n', pos + 1)
+        if starts[-1] >= len(data) and len(starts) > 1:
+            starts.pop()  # trailing newline: no phantom empty last line
+        return starts
+
+    @staticmethod
+    def _iter_lines(data: bytes, starts: List[int]):
+        """Yield each line (with its ending) as a slice of the buffer."""
+        n = len(data)
+        last = len(starts) - 1
+        for idx, start in enumerate(starts):
+            yield data[start:starts[idx + 1]] if idx < last else data[start:n]
+
+    @staticmethod
+    def _line_at(data: bytes, starts: List[int], line_num: int) -> bytes:
+        """Slice the 1-based line_num out of the buffer."""
+        start = starts[line_num - 1]
+        end = starts[line_num] if line_num < len(starts) else len(data)
+        return data[start:end]
+
+    def _iter_naming_matches(self, content: bytes) -> Iterator[tuple]:
+        """Yield ("class" | "const", match) for the whole-file naming scans.
+
+        With python-hyperscan available, candidate offsets come from a single
+        multi-pattern scan of the buffer and the capturing re patterns run
+        only at those offsets; otherwise each pattern runs its own finditer.
+        """
+        pats = (("class", self._pat_class), ("const", self._pat_const))
+
+        if self._hs_db is None:
+            for rule, pat in pats:
+                yield from ((rule, m) for m in pat.finditer(content))
+            return
+
+        hits: List[tuple] = []
+        self._hs_db.scan(content, match_event_handler=lambda pat_id, start, end, flags, ctx: hits.append((pat_id, start)))
+        # Hyperscan reports every match end per site; dedupe by the start of
+        # the re match so each declaration is yielded once.
+        seen = set()
+        for pat_id, start in hits:
+            rule, pat = pats[pat_id]
+            match = pat.match(content, start)
+            if match and (pat_id, match.start()) not in seen:
+                seen.add((pat_id, match.start()))
+                yield rule, match
+
+    def _check_naming_conventions(self, file_path: str, data: bytes, starts: List[int]) -> List[Violation]:
         """Check naming convention violations."""
         violations = []
-        content = '\n'.join(lines)
-        
-        # Check class names
-        class_pattern = r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        for match in re.finditer(class_pattern, content):
-            class_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            
-            if line_num <= len(lines) and not re.match(self.guidelines["naming_conventions"]["class_names"]["pattern"], class_name):
+        content, line_starts = data, starts
+        rule_info = self._rule_info
+        desc_class, sev_class, _ = rule_info["class_naming"]
+        desc_func, sev_func, _ = rule_info["function_naming"]
+        desc_member, sev_member, _ = rule_info["member_variable_naming"]
+        desc_const, sev_const, _ = rule_info["constant_naming"]
+
+        # Check class and constant names (whole-file scans)
+        for rule, match in self._iter_naming_matches(content):
+            name = match.group(1)
+            line_num = bisect_right(line_starts, match.start())
+            if line_num > len(line_starts):
+                continue
+
+            if rule == "class":
+                if not self._pat_class_name.match(name):
+                    violations.append(Violation(
+                        rule_name="class_naming",
+                        description=desc_class,
+                        file_path=file_path,
+                        line_number=line_num,
+                        line_content=_text(self._line_at(content, line_starts, line_num).strip()),
+                        severity=sev_class,
+                        suggestion=("class_naming", (_text(name),))
+                    ))
+            elif not self._pat_constant_name.match(name):
                 violations.append(Violation(
-                    rule_name="class_naming",
-                    description=self.guidelines["naming_conventions"]["class_names"]["rule"],
+                    rule_name="constant_naming",
+                    description=desc_const,
                     file_path=file_path,
                     line_number=line_num,
-                    line_content=lines[line_num-1].strip(),
-                    severity=self.guidelines["naming_conventions"]["class_names"]["severity"],
-                    suggestion=f"Class name '{class_name}' should use PascalCase"
+                    line_content=_text(self._line_at(content, line_starts, line_num).strip()),
+                    severity=sev_const,
+                    suggestion=("constant_naming", (_text(name),))
                 ))
         
         # Check function names (public methods)
-        function_pattern = r'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:const\s*)?(?:{|;)'
-        for i, line in enumerate(lines, 1):
-            match = re.search(function_pattern, line)
-            if match and not line.strip().startswith('//'):
+        for i, line in enumerate(self._iter_lines(content, line_starts), 1):
+            if b'(' not in line:
+                continue
+            match = self._pat_function.search(line)
+            if not match:
+                continue
+            stripped = line.strip()
+            if not stripped.startswith(b'//'):
                 func_name = match.group(1)
-                
+
                 # Skip common keywords, operators, and constructors/destructors
-                if func_name in ['if', 'for', 'while', 'switch', 'catch', 'return', 'sizeof', 'main'] or func_name.startswith('~'):
+                if func_name in (b'if', b'for', b'while', b'switch', b'catch', b'return', b'sizeof', b'main') or func_name.startswith(b'~'):
                     continue
-                
-                if not re.match(self.guidelines["naming_conventions"]["function_names"]["pattern"], func_name):
+
+                if not self._pat_function_name.match(func_name):
                     violations.append(Violation(
                         rule_name="function_naming",
-                        description=self.guidelines["naming_conventions"]["function_names"]["rule"],
+                        description=desc_func,
                         file_path=file_path,
                         line_number=i,
-                        line_content=line.strip(),
-                        severity=self.guidelines["naming_conventions"]["function_names"]["severity"],
-                        suggestion=f"Function name '{func_name}' should use PascalCase"
+                        line_content=_text(stripped),
+                        severity=sev_func,
+                        suggestion=("function_naming", (_text(func_name),))
                     ))
         
-        # Check member variables (look for m_ prefix)
-        member_var_pattern = r'^\s*(?:static\s+|const\s+|mutable\s+)*[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[;=]'
-        in_class = False
-        brace_count = 0
-        
-        for i, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Track if we're inside a class
-            if 'class ' in stripped_line or 'struct ' in stripped_line:
-                in_class = True
-                brace_count = 0
-            
-            brace_count += stripped_line.count('{') - stripped_line.count('}')
-            
-            if in_class and brace_count <= 0 and i > 1:
-                in_class = False
-            
-            # Check member variables inside class
-            if in_class and 'private:' in stripped_line:
+        # Check member variables (look for m_ prefix): one sweep over the
+        # buffer emits the class-body line ranges, and the member pattern only
+        # runs on lines inside a class.
+        for i in self._class_body_lines(content, line_starts):
+            stripped_line = self._line_at(content, line_starts, i).strip()
+            if not stripped_line or stripped_line.startswith(b'//') or b'private:' in stripped_line:
                 continue
-            elif in_class and stripped_line and not stripped_line.startswith('//'):
-                match = re.search(member_var_pattern, stripped_line)
-                if match:
-                    var_name = match.group(1)
-                    if not var_name.startswith('m_') and not re.match(self.guidelines["naming_conventions"]["member_variables"]["pattern"], var_name):
-                        violations.append(Violation(
-                            rule_name="member_variable_naming",
-                            description=self.guidelines["naming_conventions"]["member_variables"]["rule"],
-                            file_path=file_path,
-                            line_number=i,
-                            line_content=line.strip(),
-                            severity=self.guidelines["naming_conventions"]["member_variables"]["severity"],
-                            suggestion=f"Member variable '{var_name}' should be prefixed with 'm_'"
-                        ))
-        
-        # Check constants (const variables)
-        const_pattern = r'const\s+[a-zA-Z_][a-zA-Z0-9_<>:]*\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        for match in re.finditer(const_pattern, content):
-            const_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            
-            if line_num <= len(lines) and not re.match(self.guidelines["naming_conventions"]["constant_names"]["pattern"], const_name):
-                violations.append(Violation(
-                    rule_name="constant_naming",
-                    description=self.guidelines["naming_conventions"]["constant_names"]["rule"],
-                    file_path=file_path,
-                    line_number=line_num,
-                    line_content=lines[line_num-1].strip(),
-                    severity=self.guidelines["naming_conventions"]["constant_names"]["severity"],
-                    suggestion=f"Constant '{const_name}' should use 'k' prefix followed by PascalCase"
-                ))
-        
-        return violations
-    
-    def _check_best_practices(self, file_path: str, lines: List[str], is_header: bool) -> List[Violation]:
-        """Check best practice violations."""
-        violations = []
-        content = '\n'.join(lines)
-        
-        # Check for using namespace std in headers
-        if is_header:
-            for i, line in enumerate(lines, 1):
-                if re.search(self.guidelines["best_practices"]["namespace_std_in_headers"]["pattern"], line):
-                    violations.append(Violation(
-                        rule_name="namespace_usage",
-                        description=self.guidelines["best_practices"]["namespace_std_in_headers"]["rule"],
-                        file_path=file_path,
-                        line_number=i,
-                        line_content=line.strip(),
-                        severity=self.guidelines["best_practices"]["namespace_std_in_headers"]["severity"],
-                        suggestion="Use specific std:: prefixes instead"
-                    ))
-        
-        # Check for raw memory management
-        memory_keywords = self.guidelines["best_practices"]["smart_pointers"]["keywords"]
-        for i, line in enumerate(lines, 1):
-            for keyword in memory_keywords:
-                if re.search(rf'\b{keyword}\b', line) and not line.strip().startswith('//'):
+            match = self._pat_member_var.search(stripped_line)
+            if match:
+                var_name = match.group(1)
+                if not var_name.startswith(b'm_') and not self._pat_member_name.match(var_name):
                     violations.append(Violation(
-                        rule_name="smart_pointers",
-                        description=self.guidelines["best_practices"]["smart_pointers"]["rule"],
+                        rule_name="member_variable_naming",
+                        description=desc_member,
                         file_path=file_path,
                         line_number=i,
-                        line_content=line.strip(),
-                        severity=self.guidelines["best_practices"]["smart_pointers"]["severity"],
-                        suggestion=self.guidelines["best_practices"]["smart_pointers"]["suggestion"]
+                        line_content=_text(stripped_line),
+                        severity=sev_member,
+                        suggestion=("member_naming", (_text(var_name),))
                     ))
-        
-        # Check for NULL/0 instead of nullptr
-        for i, line in enumerate(lines, 1):
-            if re.search(self.guidelines["best_practices"]["nullptr_usage"]["pattern"], line) and not line.strip().startswith('//'):
-                violations.append(Violation(
-                    rule_name="nullptr_usage",
-                    description=self.guidelines["best_practices"]["nullptr_usage"]["rule"],
-                    file_path=file_path,
-                    line_number=i,
-                    line_content=line.strip(),
-                    severity=self.guidelines["best_practices"]["nullptr_usage"]["severity"],
-                    suggestion=self.guidelines["best_practices"]["nullptr_usage"]["suggestion"]
-                ))
-        
+
         return violations
+
+    def _class_body_lines(self, content: bytes, starts: List[int]) -> Iterator[int]:
+        """Yield the 1-based line numbers that fall inside a class/struct body.
+
+        One pass collects every brace offset; each class keyword then binary-
+        searches to its opening brace and walks the precomputed events until
+        the depth returns to its entry value. That replaces the old per-line
+        brace-counting state machine, which rescanned each line twice and
+        mis-tracked forward declarations and opening braces on their own line
+        (the 'brace_count <= 0 and i > 1' exit). The keyword line is included
+        and the closing-brace line excluded, as before; overlapping ranges
+        from nested classes are coalesced so each line is visited once.
+        """
+        braces = [(m.start(), 1 if m.group() == b'{' else -1)
+                  for m in self._pat_brace.finditer(content)]
+        offsets = [pos for pos, _ in braces]
+
+        ranges = []
+        for m in self._pat_class_kw.finditer(content):
+            keyword_pos = m.start()
+            idx = bisect_right(offsets, keyword_pos)
+            if idx == len(offsets) or braces[idx][1] != 1:
+                continue
+            semi = content.find(b';', keyword_pos, offsets[idx])
+            if semi != -1:
+                continue  # forward declaration
+            depth = 1
+            j = idx + 1
+            close_pos = len(content)
+            while j < len(braces):
+                depth += braces[j][1]
+                if depth == 0:
+                    close_pos = braces[j][0]
+                    break
+                j += 1
+            start_line = bisect_right(starts, keyword_pos)
+            close_line = bisect_right(starts, close_pos)
+            if close_line > start_line:
+                ranges.append((start_line, close_line))
+
+        ranges.sort()
+        next_line = 0
+        for start_line, close_line in ranges:
+            yield from range(max(start_line, next_line), close_line)
+            next_line = max(next_line, close_line)
     
-    def _check_code_structure(self, file_path: str, lines: List[str], is_header: bool) -> List[Violation]:
+    def _check_code_structure(self, file_path: str, data: bytes, starts: List[int], is_header: bool) -> List[Violation]:
         """Check code structure issues."""
         violations = []
-        
+
         # Check for include guards in headers
         if is_header:
-            content = '\n'.join(lines)
-            has_pragma_once = '#pragma once' in content
-            has_include_guard = re.search(r'#ifndef\s+[A-Z_]+\s*\n.*#define\s+[A-Z_]+', content, re.DOTALL)
-            
+            # .find, not `in`: mmap has no __contains__, so `in` would fall
+            # back to element iteration (ints vs bytes, never equal) and
+            # large mapped headers would always "lack" the pragma.
+            has_pragma_once = data.find(b'#pragma once') != -1
+            has_include_guard = self._pat_include_guard.search(data)
+
             if not has_pragma_once and not has_include_guard:
+                desc_guard, sev_guard, sugg_guard = self._rule_info["include_guards"]
                 violations.append(Violation(
                     rule_name="include_guards",
-                    description=self.guidelines["code_structure"]["include_guards"]["rule"],
+                    description=desc_guard,
                     file_path=file_path,
                     line_number=1,
-                    line_content=lines[0].strip() if lines else "",
-                    severity=self.guidelines["code_structure"]["include_guards"]["severity"],
-                    suggestion="Add #pragma once at the top or use #ifndef guards"
+                    line_content=_text(self._line_at(data, starts, 1).strip()) if data else "",
+                    severity=sev_guard,
+                    suggestion=sugg_guard
                 ))
-        
+
         # Check function length
         current_function_start = None
+        current_function_line = b''
         brace_count = 0
-        
-        for i, line in enumerate(lines, 1):
+        max_lines = self.guidelines["code_structure"]["function_length"]["max_lines"]
+        desc_flen, sev_flen, _ = self._rule_info["function_length"]
+
+        for i, line in enumerate(self._iter_lines(data, starts), 1):
             stripped_line = line.strip()
-            
+
             # Detect function start
-            if re.search(r'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\([^)]*\)\s*(?:const\s*)?{', line):
+            if b'(' in line and _match_function_signature(line) == 0x7b:  # '{'
                 current_function_start = i
+                current_function_line = stripped_line
                 brace_count = 1
             elif current_function_start:
-                brace_count += stripped_line.count('{') - stripped_line.count('}')
-                
+                brace_count += stripped_line.count(b'{') - stripped_line.count(b'}')
+
                 if brace_count == 0:  # Function ended
                     function_length = i - current_function_start + 1
-                    if function_length > self.guidelines["code_structure"]["function_length"]["max_lines"]:
+                    if function_length > max_lines:
                         violations.append(Violation(
                             rule_name="function_length",
-                            description=self.guidelines["code_structure"]["function_length"]["rule"],
+                            description=desc_flen,
                             file_path=file_path,
                             line_number=current_function_start,
-                            line_content=lines[current_function_start-1].strip(),
-                            severity=self.guidelines["code_structure"]["function_length"]["severity"],
-                            suggestion=f"Function is {function_length} lines long, consider breaking it down"
+                            line_content=_text(current_function_line),
+                            severity=sev_flen,
+                            suggestion=("function_length", (function_length,))
                         ))
                     current_function_start = None
-        
-        return violations
-    
-    def _check_modern_cpp(self, file_path: str, lines: List[str]) -> List[Violation]:
-        """Check modern C++ feature usage."""
-        violations = []
-        
-        # Check lambda default captures
-        for i, line in enumerate(lines, 1):
-            if re.search(self.guidelines["modern_cpp"]["lambda_captures"]["pattern"], line):
-                violations.append(Violation(
-                    rule_name="lambda_captures",
-                    description=self.guidelines["modern_cpp"]["lambda_captures"]["rule"],
-                    file_path=file_path,
-                    line_number=i,
-                    line_content=line.strip(),
-                    severity=self.guidelines["modern_cpp"]["lambda_captures"]["severity"],
-                    suggestion=self.guidelines["modern_cpp"]["lambda_captures"]["suggestion"]
-                ))
-        
+
         return violations
     
-    def _check_comments(self, file_path: str, lines: List[str], is_header: bool) -> List[Violation]:
+    def _check_comments(self, file_path: str, lines: Iterable[bytes], is_header: bool) -> List[Violation]:
         """Check comment requirements."""
         violations = []
-        
+
         if is_header:
+            desc_fc, sev_fc, sugg_fc = self._rule_info["function_comments"]
+
+            # Running lookback: remember the last line that carried a doxygen
+            # token and compare distances, instead of rescanning a window of
+            # prior lines at every function signature.
+            last_doxygen_line = -5
+
             # Check for function comments in headers
             for i, line in enumerate(lines, 1):
-                if re.search(r'^\s*(?:virtual\s+|static\s+|inline\s+)*(?:const\s+)?[a-zA-Z_][a-zA-Z0-9_<>:]*\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\([^)]*\)\s*(?:const\s*)?[;{]', line):
-                    # Check if previous lines have doxygen comment
-                    has_doxygen = False
-                    for j in range(max(0, i-5), i):
-                        if '/**' in lines[j] or '@brief' in lines[j] or '///' in lines[j]:
-                            has_doxygen = True
-                            break
-                    
-                    if not has_doxygen and not line.strip().startswith('//'):
+                # Token scan first: the original window covered lines i-4..i,
+                # current line included, so a trailing ///< on the signature
+                # line itself counts as documentation.
+                if b'/**' in line or b'@brief' in line or b'///' in line:
+                    last_doxygen_line = i
+
+                if b'(' in line and _match_function_signature(line):
+                    stripped = line.strip()
+
+                    # Doxygen comment on this line or the 4 before it?
+                    has_doxygen = i - last_doxygen_line <= 4
+
+                    if not has_doxygen and not stripped.startswith(b'//'):
                         violations.append(Violation(
                             rule_name="function_comments",
-                            description=self.guidelines["comments"]["function_comments"]["rule"],
+                            description=desc_fc,
                             file_path=file_path,
                             line_number=i,
-                            line_content=line.strip(),
-                            severity=self.guidelines["comments"]["function_comments"]["severity"],
-                            suggestion="Add Doxygen-style comment above function declaration"
+                            line_content=_text(stripped),
+                            severity=sev_fc,
+                            suggestion=sugg_fc
                         ))
-        
+
         return violations
     
-    def analyze_pr_files(self, changed_files: List[str]) -> List[Violation]:
-        """Analyze multiple files (e.g., from a PR)."""
+    def analyze_pr_files(self, changed_files: List[str], jobs: Optional[int] = None,
+                         line_masks: Optional[Dict[str, set]] = None) -> List[Violation]:
+        """Analyze multiple files (e.g., from a PR).
+
+        Files are independent CPU-bound work, so large batches are sharded
+        across a process pool; small batches stay serial to avoid paying the
+        pool start-up cost for a handful of files. jobs caps the worker
+        count (jobs=1 forces serial); the default is one worker per core.
+
+        line_masks maps file path -> set of changed line numbers; when given,
+        only violations on those lines are returned. Analysis itself stays
+        whole-file so the content-hash and mtime caches remain valid for any
+        mask, and the filter is applied to the (cached or fresh) results.
+
+        Before any file is read, an (mtime_ns, size) index persisted across
+        runs short-circuits files untouched since the last run for the cost
+        of one os.stat — on a repeat run over a large repo only the edited
+        files pay for analysis (or even a content hash).
+        """
+        existing_files = [f for f in changed_files if os.path.exists(f)]
+
+        index = self._load_index()
+        results: Dict[str, List[Violation]] = {}
+        stats: Dict[str, tuple] = {}
+        misses: List[str] = []
+        for file_path in existing_files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                misses.append(file_path)
+                continue
+            stats[file_path] = (st.st_mtime_ns, st.st_size)
+            entry = index.get(file_path)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                results[file_path] = [Violation(**d) for d in entry[2]]
+            else:
+                misses.append(file_path)
+
+        workers = jobs if jobs else os.cpu_count()
+        if len(misses) < 4 or workers == 1:
+            if len(misses) > 1:
+                # Overlap the blocking reads (GIL released in the syscall)
+                # with the regex work on already-loaded files; large files
+                # return None here and take the mmap path in analyze_file.
+                with ThreadPoolExecutor(max_workers=min(32, len(misses))) as reader:
+                    for file_path, data in zip(misses, reader.map(_read_bytes, misses)):
+                        results[file_path] = self.analyze_file(file_path, data=data)
+            else:
+                for file_path in misses:
+                    results[file_path] = self.analyze_file(file_path)
+        else:
+            chunksize = max(1, len(misses) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.guidelines,)) as executor:
+                for file_path, violations in zip(misses, executor.map(_analyze_one, misses, chunksize=chunksize)):
+                    results[file_path] = violations
+
+        if misses:
+            for file_path in misses:
+                if file_path in stats:
+                    mtime_ns, size = stats[file_path]
+                    index[file_path] = (mtime_ns, size,
+                                        [asdict(v) for v in results[file_path]])
+            self._save_index(index)
+
         all_violations = []
-        
-        for file_path in changed_files:
-            if os.path.exists(file_path):
-                violations = self.analyze_file(file_path)
-                all_violations.extend(violations)
-        
+        for file_path in existing_files:
+            violations = results[file_path]
+            if line_masks is not None:
+                mask = line_masks.get(file_path, frozenset())
+                violations = [v for v in violations if v.line_number in mask]
+            all_violations.extend(violations)
         return all_violations
     
     def generate_report(self, violations: List[Violation], format_type: str = "text") -> str:
@@ -571,15 +1264,12 @@ class CppGuidelinesAnalyzer:
         report = f"📋 C++ Code Analysis Report\n"
         report += f"{'=' * 50}\n\n"
         
-        # Group by severity
-        errors = [v for v in violations if v.severity == "error"]
-        warnings = [v for v in violations if v.severity == "warning"]
-        info = [v for v in violations if v.severity == "info"]
-        
+        summary = summarize(violations)
+
         report += f"Summary:\n"
-        report += f"  🔴 Errors: {len(errors)}\n"
-        report += f"  🟡 Warnings: {len(warnings)}\n"
-        report += f"  🔵 Info: {len(info)}\n\n"
+        report += f"  🔴 Errors: {summary['errors']}\n"
+        report += f"  🟡 Warnings: {summary['warnings']}\n"
+        report += f"  🔵 Info: {summary['info']}\n\n"
         
         # Group by file
         files_violations = {}
@@ -597,34 +1287,52 @@ class CppGuidelinesAnalyzer:
                 report += f"{icon} Line {violation.line_number}: {violation.description}\n"
                 report += f"   Code: {violation.line_content[:80]}{'...' if len(violation.line_content) > 80 else ''}\n"
                 if violation.suggestion:
-                    report += f"   💡 {violation.suggestion}\n"
+                    report += f"   💡 {violation.suggestion_text()}\n"
                 report += "\n"
         
         return report
     
     def _generate_json_report(self, violations: List[Violation]) -> str:
         """Generate a JSON report."""
-        violations_data = []
-        for violation in violations:
-            violations_data.append({
-                "rule_name": violation.rule_name,
-                "description": violation.description,
-                "file_path": violation.file_path,
-                "line_number": violation.line_number,
-                "line_content": violation.line_content,
-                "severity": violation.severity,
-                "suggestion": violation.suggestion
-            })
-        
-        return json.dumps({
+        return dumps_json({
             "summary": {
                 "total_violations": len(violations),
-                "errors": len([v for v in violations if v.severity == "error"]),
-                "warnings": len([v for v in violations if v.severity == "warning"]),
-                "info": len([v for v in violations if v.severity == "info"])
+                **summarize(violations)
             },
-            "violations": violations_data
-        }, indent=2)
+            "violations": violations_to_dicts(violations)
+        })
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    """Prefetch a file's bytes for analyze_file; None defers to its own I/O.
+
+    Large files are left to the mmap path, and read errors fall through to
+    analyze_file's error handling on its own read attempt.
+    """
+    try:
+        if os.path.getsize(path) >= _MMAP_THRESHOLD:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# Per-process analyzer for the pool in analyze_pr_files: built once per
+# worker by the initializer so each process compiles the guideline patterns
+# exactly once instead of per file.
+_worker_analyzer: Optional[CppGuidelinesAnalyzer] = None
+
+
+def _init_worker(guidelines: Dict[str, Any]) -> None:
+    """Construct the per-process analyzer from the parent's guidelines."""
+    global _worker_analyzer
+    _worker_analyzer = CppGuidelinesAnalyzer(guidelines=guidelines)
+
+
+def _analyze_one(file_path: str) -> List[Violation]:
+    """Analyze a single file inside a pool worker."""
+    return _worker_analyzer.analyze_file(file_path)
 
 
 def main():
@@ -5,105 +5,372 @@ Analyzes files changed in a GitHub PR for coding guideline violations.
 """
 
 import os
+import re
+import heapq
+import string
 import subprocess
 import json
+from collections import defaultdict
 import requests
 from typing import List, Dict, Any, Optional
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 import argparse
-from cpp_code_analyzer import CppGuidelinesAnalyzer
+from cpp_code_analyzer import CppGuidelinesAnalyzer, dumps_json, summarize, violations_to_dicts
+
+# Only these extensions are worth handing to the C++ analyzer; PR file lists
+# are typically dominated by docs, configs and other non-C++ churn.
+CPP_EXTENSIONS = {'.cpp', '.cc', '.cxx', '.c++', '.c', '.h', '.hpp', '.hh', '.hxx'}
+
+# Vendored/third-party code is not ours to lint.
+VENDORED_PATH_PATTERN = re.compile(r'(^|/)(third_party|third-party|vendor|external)/')
+
+# Skip pathological blobs (generated amalgamations, embedded data) outright.
+MAX_FILE_SIZE = 2_000_000
+
+# '@@ -a,b +c,d @@' hunk header; group 1/2 are the post-image start and count.
+HUNK_HEADER_PATTERN = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+# Severity ordering and markers for the PR comment, built once instead of a
+# fresh dict literal per violation.
+_SEV_RANK = {"error": 0, "warning": 1, "info": 2}
+_SEV_ICON = {"error": "🔴", "warning": "🟡", "info": "🔵"}
+
+# Static scaffold of the PR comment, prepared once at import.
+_HEADER_TMPL = string.Template(
+    "## 📋 Code Analysis Report\n\n"
+    "**Language:** $lang\n"
+    "**Files Analyzed:** $files\n\n"
+    "### Summary\n"
+    "- 🔴 **Errors:** $errors\n"
+    "- 🟡 **Warnings:** $warnings\n"
+    "- 🔵 **Info:** $info\n\n")
+
 
 class PRAnalyzer:
     """Analyzes PR files for coding guideline violations."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None,
+                 guidelines_file: Optional[str] = None):
+        # Lazily started persistent `git cat-file --batch` subprocess for
+        # reading blobs at arbitrary revisions (see _read_blob). Assigned
+        # first so __del__ -> close() is safe even when a later step of
+        # construction raises.
+        self._cat: Optional[subprocess.Popen] = None
         self.github_token = github_token
+        # One analyzer for the whole run: the guideline rules are loaded and
+        # their patterns compiled once, and its result caches stay warm
+        # across analyze/render calls.
+        self.cpp_analyzer = CppGuidelinesAnalyzer(guidelines_file)
         self.headers = {}
         if github_token:
             self.headers["Authorization"] = f"token {github_token}"
+        # One pooled session for all GitHub calls: the TCP/TLS connection is
+        # reused across requests instead of a fresh handshake per call.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+    def close(self) -> None:
+        """Shut down the persistent git subprocess, if one was started."""
+        if self._cat is not None:
+            try:
+                self._cat.stdin.close()
+                self._cat.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._cat.kill()
+            self._cat = None
+
+    def __enter__(self) -> "PRAnalyzer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def _git_cat_proc(self) -> subprocess.Popen:
+        """Start (once) and return the `git cat-file --batch` subprocess."""
+        if self._cat is None:
+            self._cat = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                bufsize=0
+            )
+        return self._cat
+
+    def _read_blob(self, revision: str, path: str) -> Optional[bytes]:
+        """Read the blob at revision:path, or None if it does not exist.
+
+        All reads go through one long-running `git cat-file --batch` process
+        instead of forking `git show` per file, which removes the ~10 ms
+        fork+exec cost per lookup when fetching base-revision contents for
+        many files. The batch protocol frames each response as
+        '<oid> blob <size>\\n' followed by the bytes and a newline.
+        """
+        try:
+            proc = self._git_cat_proc()
+            proc.stdin.write(f"{revision}:{path}\n".encode())
+            proc.stdin.flush()
+
+            header = proc.stdout.readline().split()
+            if len(header) != 3 or header[1] != b"blob":
+                # Non-blob objects (e.g. a tree when path names a directory)
+                # are still framed with a payload; drain it so the stream
+                # stays in sync for the next request. Only 'missing'
+                # responses (two fields) carry no payload.
+                if len(header) == 3:
+                    remaining = int(header[2]) + 1
+                    while remaining > 0:
+                        chunk = proc.stdout.read(remaining)
+                        if not chunk:
+                            break
+                        remaining -= len(chunk)
+                return None
+
+            size = int(header[2])
+            data = bytearray()
+            while len(data) < size:
+                chunk = proc.stdout.read(size - len(data))
+                if not chunk:
+                    return None
+                data += chunk
+            proc.stdout.read(1)  # trailing newline after the payload
+
+            return bytes(data)
+
+        except (OSError, ValueError):
+            return None
     
+    # Selects only the two fields we use; 100 files per round trip.
+    _PR_FILES_QUERY = (
+        "query($owner: String!, $name: String!, $number: Int!, $cursor: String) { "
+        "repository(owner: $owner, name: $name) { "
+        "pullRequest(number: $number) { "
+        "files(first: 100, after: $cursor) { "
+        "pageInfo { hasNextPage endCursor } "
+        "nodes { path changeType } } } } }")
+
     def get_pr_changed_files(self, repo_owner: str, repo_name: str, pr_number: int) -> List[str]:
-        """Get list of files changed in a PR using GitHub API."""
+        """Get list of files changed in a PR using GitHub API.
+
+        With a token, a single GraphQL query fetches just the path and change
+        type of up to 100 files per round trip; the REST endpoint pages 30
+        files at a time by default and returns full per-file payloads we
+        discard. Without a token (GraphQL requires one), or if the GraphQL
+        call fails, fall back to REST with per_page=100.
+        """
+        if self.github_token:
+            return self._get_pr_files_graphql(repo_owner, repo_name, pr_number)
+        return self._get_pr_files_rest(repo_owner, repo_name, pr_number)
+
+    def _get_pr_files_graphql(self, repo_owner: str, repo_name: str, pr_number: int) -> List[str]:
+        """Page through a PR's changed files with the GraphQL API."""
+        changed_files = []
+        cursor = None
+
+        try:
+            while True:
+                response = self.session.post(
+                    "https://api.github.com/graphql",
+                    json={"query": self._PR_FILES_QUERY,
+                          "variables": {"owner": repo_owner, "name": repo_name,
+                                        "number": pr_number, "cursor": cursor}})
+                response.raise_for_status()
+
+                payload = response.json()
+                if payload.get("errors"):
+                    raise requests.RequestException(payload["errors"][0].get("message", "GraphQL error"))
+
+                files = payload["data"]["repository"]["pullRequest"]["files"]
+                for node in files["nodes"]:
+                    # Only include files that exist (not deleted)
+                    if node["changeType"] != "DELETED":
+                        changed_files.append(node["path"])
+
+                page_info = files["pageInfo"]
+                if not page_info["hasNextPage"]:
+                    return changed_files
+                cursor = page_info["endCursor"]
+
+        except (requests.RequestException, KeyError, TypeError) as e:
+            print(f"Error fetching PR files via GraphQL: {e}")
+            return self._get_pr_files_rest(repo_owner, repo_name, pr_number)
+
+    def _get_pr_files_rest(self, repo_owner: str, repo_name: str, pr_number: int) -> List[str]:
+        """Page through a PR's changed files with the REST API.
+
+        Each page carries full per-file payloads (patch text included) of
+        which we keep two fields. With ijson installed the response is
+        parsed incrementally off the wire, one entry at a time, instead of
+        buffering the page and building its whole object tree; the result
+        stays a list because callers report and re-iterate the file count.
+        """
         url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/files"
-        
+        changed_files = []
+        page = 1
+
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            files_data = response.json()
-            changed_files = []
-            
-            for file_info in files_data:
-                # Only include files that exist (not deleted)
-                if file_info["status"] != "removed":
-                    changed_files.append(file_info["filename"])
-            
-            return changed_files
-            
+            while True:
+                response = self.session.get(url, params={"per_page": 100, "page": page},
+                                            stream=ijson is not None)
+                response.raise_for_status()
+
+                if ijson is not None:
+                    response.raw.decode_content = True
+                    page_count = 0
+                    for file_info in ijson.items(response.raw, 'item'):
+                        page_count += 1
+                        # Only include files that exist (not deleted)
+                        if file_info["status"] != "removed":
+                            changed_files.append(file_info["filename"])
+                else:
+                    files_data = response.json()
+                    page_count = len(files_data)
+                    for file_info in files_data:
+                        # Only include files that exist (not deleted)
+                        if file_info["status"] != "removed":
+                            changed_files.append(file_info["filename"])
+
+                if page_count < 100:
+                    return changed_files
+                page += 1
+
         except requests.RequestException as e:
             print(f"Error fetching PR files: {e}")
-            return []
+            return changed_files
     
     def get_git_changed_files(self, base_branch: str = "main") -> List[str]:
-        """Get list of changed files using git diff."""
+        """Get list of changed files using git diff.
+
+        --diff-filter=d excludes deletions, so git itself guarantees every
+        listed path exists and no per-file stat call is needed.
+        """
         try:
             # Get changed files compared to base branch
             result = subprocess.run(
-                ["git", "diff", "--name-only", f"{base_branch}...HEAD"],
+                ["git", "diff", "--name-only", "--diff-filter=d", f"{base_branch}...HEAD"],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
-            changed_files = [f.strip() for f in result.stdout.split('\n') if f.strip()]
-            
-            # Filter to only existing files
-            existing_files = [f for f in changed_files if os.path.exists(f)]
-            
-            return existing_files
-            
+
+            return [f.strip() for f in result.stdout.split('\n') if f.strip()]
+
         except subprocess.CalledProcessError as e:
             print(f"Error getting git changed files: {e}")
             return []
-    
+
     def get_staged_files(self) -> List[str]:
-        """Get list of staged files using git."""
+        """Get list of staged files using git, excluding staged deletions."""
         try:
             result = subprocess.run(
-                ["git", "diff", "--cached", "--name-only"],
+                ["git", "diff", "--cached", "--name-only", "--diff-filter=d"],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
-            staged_files = [f.strip() for f in result.stdout.split('\n') if f.strip()]
-            existing_files = [f for f in staged_files if os.path.exists(f)]
-            
-            return existing_files
-            
+
+            return [f.strip() for f in result.stdout.split('\n') if f.strip()]
+
         except subprocess.CalledProcessError as e:
             print(f"Error getting staged files: {e}")
             return []
     
-    def analyze_pr_files(self, files: List[str], language: str = "cpp") -> Dict[str, Any]:
-        """Analyze files for coding guideline violations."""
+    def get_changed_line_masks(self, base_branch: Optional[str] = None) -> Dict[str, set]:
+        """Map each changed file to the set of its added/modified line numbers.
+
+        Runs `git diff --unified=0` (against base_branch...HEAD, or the
+        staged changes when base_branch is None) and parses the hunk headers:
+        a '+c,d' post-image range marks lines c..c+d-1 as changed, and
+        deletion-only hunks (d == 0) mark nothing. The masks let analysis
+        report only on the lines a PR actually touched.
+        """
+        if base_branch:
+            cmd = ["git", "diff", "--unified=0", f"{base_branch}...HEAD"]
+        else:
+            cmd = ["git", "diff", "--cached", "--unified=0"]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"Error getting changed lines: {e}")
+            return {}
+
+        masks: Dict[str, set] = {}
+        current: Optional[set] = None
+        for line in result.stdout.splitlines():
+            if line.startswith('+++ '):
+                target = line[4:]
+                if target.startswith('b/'):
+                    target = target[2:]
+                current = None if target == '/dev/null' else masks.setdefault(target, set())
+            elif current is not None and line.startswith('@@'):
+                match = HUNK_HEADER_PATTERN.match(line)
+                if match:
+                    start = int(match.group(1))
+                    count = int(match.group(2)) if match.group(2) is not None else 1
+                    current.update(range(start, start + count))
+        return masks
+
+    def analyze_pr_files(self, files: List[str], language: str = "cpp",
+                         jobs: Optional[int] = None,
+                         line_masks: Optional[Dict[str, set]] = None) -> Dict[str, Any]:
+        """Analyze files for coding guideline violations.
+
+        jobs caps the analyzer's worker processes (1 forces serial); the
+        default scales to the core count.
+
+        Non-C++ files, vendored paths and oversized blobs are filtered out
+        here so the analyzer never opens or scans them. With line_masks (from
+        get_changed_line_masks), only violations on changed lines survive.
+        """
         if language.lower() == "cpp":
-            analyzer = CppGuidelinesAnalyzer()
-            violations = analyzer.analyze_pr_files(files)
+            candidates = self._filter_analyzable(files)
+            violations = self.cpp_analyzer.analyze_pr_files(candidates, jobs=jobs,
+                                                            line_masks=line_masks)
             
+            summary = summarize(violations)
             return {
                 "language": language,
-                "files_analyzed": len(files),
-                "total_violations": len(violations),
+                "files_analyzed": len(candidates),
+                "total_violations": sum(summary.values()),
                 "violations": violations,
-                "summary": {
-                    "errors": len([v for v in violations if v.severity == "error"]),
-                    "warnings": len([v for v in violations if v.severity == "warning"]),
-                    "info": len([v for v in violations if v.severity == "info"])
-                }
+                "summary": summary
             }
         else:
             print(f"Language {language} not supported yet")
             return {}
+
+    @staticmethod
+    def _filter_analyzable(files: List[str]) -> List[str]:
+        """Drop files the C++ analyzer should never open.
+
+        Filters by extension, vendored path and size; a missing file (e.g. a
+        PR-listed path not present in the working tree) is skipped the same
+        way the analyzer itself would skip it.
+        """
+        candidates = []
+        for path in files:
+            if os.path.splitext(path)[1].lower() not in CPP_EXTENSIONS:
+                continue
+            if VENDORED_PATH_PATTERN.search(path.replace(os.sep, '/')):
+                continue
+            try:
+                if os.path.getsize(path) >= MAX_FILE_SIZE:
+                    continue
+            except OSError:
+                continue
+            candidates.append(path)
+
+        skipped = len(files) - len(candidates)
+        if skipped:
+            print(f"Skipping {skipped} non-C++, vendored, oversized or missing files")
+        return candidates
     
     def generate_pr_comment(self, analysis_result: Dict[str, Any]) -> str:
         """Generate a GitHub PR comment with analysis results."""
@@ -112,62 +379,73 @@ class PRAnalyzer:
         
         violations = analysis_result["violations"]
         summary = analysis_result["summary"]
-        
-        comment = "## 📋 Code Analysis Report\n\n"
-        comment += f"**Language:** {analysis_result['language'].upper()}\n"
-        comment += f"**Files Analyzed:** {analysis_result['files_analyzed']}\n\n"
-        
-        comment += "### Summary\n"
-        comment += f"- 🔴 **Errors:** {summary['errors']}\n"
-        comment += f"- 🟡 **Warnings:** {summary['warnings']}\n"
-        comment += f"- 🔵 **Info:** {summary['info']}\n\n"
-        
+
+        # Accumulate fragments and join once: repeated += on a growing str
+        # reallocates the whole comment on every append.
+        parts: List[str] = []
+        parts.append(_HEADER_TMPL.substitute(
+            lang=analysis_result['language'].upper(),
+            files=analysis_result['files_analyzed'],
+            errors=summary['errors'],
+            warnings=summary['warnings'],
+            info=summary['info']))
+
         if summary['errors'] > 0:
-            comment += "❗ **Please fix the errors before merging.**\n\n"
-        
-        # Group violations by file
-        files_violations = {}
-        for violation in violations:
-            if violation.file_path not in files_violations:
-                files_violations[violation.file_path] = []
-            files_violations[violation.file_path].append(violation)
-        
+            parts.append("❗ **Please fix the errors before merging.**\n\n")
+
         # Show top violations (limit to prevent huge comments)
         max_files = 5
         max_violations_per_file = 10
-        
-        comment += "### Issues Found\n\n"
-        
-        for i, (file_path, file_violations) in enumerate(files_violations.items()):
-            if i >= max_files:
-                remaining_files = len(files_violations) - max_files
-                comment += f"... and {remaining_files} more files\n"
-                break
-                
-            comment += f"#### 📁 `{file_path}`\n\n"
-            
-            # Sort by severity (errors first)
-            sorted_violations = sorted(file_violations, 
-                                     key=lambda x: {"error": 0, "warning": 1, "info": 2}[x.severity])
-            
-            for j, violation in enumerate(sorted_violations):
-                if j >= max_violations_per_file:
-                    remaining = len(sorted_violations) - max_violations_per_file
-                    comment += f"... and {remaining} more issues in this file\n\n"
-                    break
-                    
-                icon = {"error": "🔴", "warning": "🟡", "info": "🔵"}[violation.severity]
-                comment += f"{icon} **Line {violation.line_number}:** {violation.description}\n"
-                
+
+        # Bounded streaming selection: only the first max_files files get a
+        # bucket, and each bucket is a size-capped heap keeping the most
+        # severe entries (ties resolved by arrival order, exactly like a
+        # stable sort-then-truncate). Everything past the caps just bumps a
+        # counter for the "... and N more" lines, so the work and memory here
+        # stay O(max_files * max_violations_per_file) however many violations
+        # a PR produces.
+        buckets: Dict[str, List[tuple]] = {}
+        totals: Dict[str, int] = defaultdict(int)
+        for seq, violation in enumerate(violations):
+            path = violation.file_path
+            totals[path] += 1
+            bucket = buckets.get(path)
+            if bucket is None:
+                if len(buckets) >= max_files:
+                    continue
+                bucket = buckets[path] = []
+            rank = _SEV_RANK[violation.severity]
+            entry = (-rank, -seq, violation)  # negated: heapq pops smallest
+            if len(bucket) < max_violations_per_file:
+                heapq.heappush(bucket, entry)
+            elif entry > bucket[0]:
+                heapq.heapreplace(bucket, entry)
+
+        parts.append("### Issues Found\n\n")
+
+        for file_path, bucket in buckets.items():
+            parts.append(f"#### 📁 `{file_path}`\n\n")
+
+            for _, _, violation in sorted(bucket, reverse=True):
+                icon = _SEV_ICON[violation.severity]
+                parts.append(f"{icon} **Line {violation.line_number}:** {violation.description}\n")
+
                 if violation.suggestion:
-                    comment += f"💡 *{violation.suggestion}*\n"
-                    
-                comment += "\n"
-        
-        comment += "\n---\n"
-        comment += "*This analysis was generated automatically. Please review and address the issues above.*"
-        
-        return comment
+                    parts.append(f"💡 *{violation.suggestion_text()}*\n")
+
+                parts.append("\n")
+
+            if totals[file_path] > max_violations_per_file:
+                remaining = totals[file_path] - max_violations_per_file
+                parts.append(f"... and {remaining} more issues in this file\n\n")
+
+        if len(totals) > max_files:
+            parts.append(f"... and {len(totals) - max_files} more files\n")
+
+        parts.append("\n---\n")
+        parts.append("*This analysis was generated automatically. Please review and address the issues above.*")
+
+        return "".join(parts)
 
 
 def main():
@@ -183,11 +461,17 @@ def main():
                        default="text", help="Output format")
     parser.add_argument("--output", help="Output file (default: stdout)")
     parser.add_argument("--github-token", help="GitHub token for API access")
+    parser.add_argument("--jobs", type=int,
+                        help="Number of analysis worker processes (default: CPU count)")
+    parser.add_argument("--changed-lines-only", action="store_true",
+                        help="Only report violations on lines changed in the diff "
+                             "(with --git-diff or --staged)")
     
     args = parser.parse_args()
     
     analyzer = PRAnalyzer(args.github_token)
     files_to_analyze = []
+    line_masks = None
     
     # Determine which files to analyze
     if args.pr:
@@ -204,10 +488,14 @@ def main():
     elif args.git_diff is not None:
         files_to_analyze = analyzer.get_git_changed_files(args.git_diff)
         print(f"Found {len(files_to_analyze)} changed files compared to {args.git_diff}")
-        
+        if args.changed_lines_only:
+            line_masks = analyzer.get_changed_line_masks(args.git_diff)
+
     elif args.staged:
         files_to_analyze = analyzer.get_staged_files()
         print(f"Found {len(files_to_analyze)} staged files")
+        if args.changed_lines_only:
+            line_masks = analyzer.get_changed_line_masks()
         
     elif args.files:
         files_to_analyze = args.files
@@ -221,23 +509,14 @@ def main():
         return
     
     # Analyze the files
-    analysis_result = analyzer.analyze_pr_files(files_to_analyze, args.language)
+    analysis_result = analyzer.analyze_pr_files(files_to_analyze, args.language,
+                                                jobs=args.jobs, line_masks=line_masks)
     
     # Generate output
     if args.format == "json":
         # Convert violations to dict for JSON serialization
-        violations_data = []
-        for v in analysis_result.get("violations", []):
-            violations_data.append({
-                "rule_name": v.rule_name,
-                "description": v.description,
-                "file_path": v.file_path,
-                "line_number": v.line_number,
-                "line_content": v.line_content,
-                "severity": v.severity,
-                "suggestion": v.suggestion
-            })
-        
+        violations_data = violations_to_dicts(analysis_result.get("violations", []))
+
         output = {
             "language": analysis_result.get("language"),
             "files_analyzed": analysis_result.get("files_analyzed"),
@@ -246,15 +525,14 @@ def main():
             "violations": violations_data
         }
         
-        output_text = json.dumps(output, indent=2)
+        output_text = dumps_json(output)
         
     elif args.format == "pr-comment":
         output_text = analyzer.generate_pr_comment(analysis_result)
         
     else:  # text format
         if analysis_result.get("violations"):
-            cpp_analyzer = CppGuidelinesAnalyzer()
-            output_text = cpp_analyzer.generate_report(analysis_result["violations"], "text")
+            output_text = analyzer.cpp_analyzer.generate_report(analysis_result["violations"], "text")
         else:
             output_text = "✅ No coding guideline violations found!"
     